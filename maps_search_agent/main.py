@@ -6,20 +6,17 @@ Fully offline, screen-based AI agent for autonomous Maps Search Evaluation tasks
 
 import sys
 import time
+import atexit
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 import signal
+import threading
 from typing import Dict, Any
 
-from mouse_controller import MouseController
-from keyboard_sim import KeyboardSimulator
-from ocr_reader import OCRReader
-from rating_engine import RatingEngine
-from comment_generator import CommentGenerator
 from throttler import TaskThrottler
 from logger import TaskLogger
-from qa_agent import QAAgent
-from screenshot_logger import ScreenshotLogger
 
 
 class MapsSearchAgent:
@@ -27,19 +24,31 @@ class MapsSearchAgent:
     
     def __init__(self):
         self.running = False
+        self._stop_event = threading.Event()
         self.setup_logging()
         self.load_guidelines()
         self.initialize_components()
         
     def setup_logging(self):
         """Setup main application logging"""
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler('agent.log', delay=True)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        file_handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+        
+        # Log calls only enqueue; a background listener does the actual writes
+        log_queue = queue.Queue(-1)
+        self.log_listener = QueueListener(log_queue, file_handler, stream_handler)
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)
+        
+        # Records reach the listener unformatted; its handlers apply the formatter above
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('agent.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=[queue_handler]
         )
         self.logger = logging.getLogger(__name__)
         
@@ -61,6 +70,17 @@ class MapsSearchAgent:
     def initialize_components(self):
         """Initialize all agent components"""
         try:
+            # GUI/OCR stacks (pyautogui, PIL, cv2, pytesseract) are imported
+            # here so startup failures such as a missing guidelines file exit
+            # before paying for them
+            from mouse_controller import MouseController
+            from keyboard_sim import KeyboardSimulator
+            from ocr_reader import OCRReader
+            from rating_engine import RatingEngine
+            from comment_generator import CommentGenerator
+            from qa_agent import QAAgent
+            from screenshot_logger import ScreenshotLogger
+            
             self.mouse = MouseController()
             self.keyboard = KeyboardSimulator()
             self.ocr = OCRReader()
@@ -80,6 +100,8 @@ class MapsSearchAgent:
         """Handle shutdown signals gracefully"""
         self.logger.info("Shutdown signal received. Stopping agent...")
         self.running = False
+        self._stop_event.set()
+        self.throttler.interrupt()
         
     def perform_task(self) -> Dict[str, Any]:
         """Perform a single Maps Search Evaluation task"""
@@ -145,6 +167,9 @@ class MapsSearchAgent:
         """Main agent loop"""
         self.logger.info("Starting Maps Search Evaluation Agent...")
         self.running = True
+        self._stop_event.clear()
+        self.throttler.reset_interrupt()
+        self.mouse.resync_position()
         
         # Setup signal handlers
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -152,31 +177,45 @@ class MapsSearchAgent:
         
         task_count = 0
         
+        # Bind per-iteration lookups once outside the loop
+        should_perform_task = self.throttler.should_perform_task
+        task_completed = self.throttler.task_completed
+        perform_task = self.perform_task
+        idle_behavior = self.mouse.idle_behavior
+        wait_if_on_break = self.throttler.wait_if_on_break
+        wait_for_stop = self._stop_event.wait
+        stop_requested = self._stop_event.is_set
+        log_info = self.logger.info
+        log_error = self.logger.error
+        
         while self.running:
             try:
                 # Check if we should perform a task (pacing control)
-                if self.throttler.should_perform_task():
-                    self.logger.info(f"Starting task #{task_count + 1}")
+                if should_perform_task():
+                    log_info(f"Starting task #{task_count + 1}")
                     
-                    task_result = self.perform_task()
+                    task_result = perform_task()
                     task_count += 1
                     
-                    self.logger.info(f"Task #{task_count} completed: {task_result['query']}")
+                    log_info(f"Task #{task_count} completed: {task_result['query']}")
                     
                     # Update throttler with task completion
-                    self.throttler.task_completed()
+                    task_completed()
                     
                 else:
-                    # Wait and perform idle behavior
-                    self.mouse.idle_behavior()
-                    time.sleep(5)  # Check again in 5 seconds
+                    # Sit out any break untouched, then wait with idle behavior
+                    wait_if_on_break()
+                    if stop_requested():
+                        break  # Shutdown cut the break short, skip idling
+                    idle_behavior()
+                    wait_for_stop(5)  # Check again in 5 seconds, or wake on shutdown
                     
             except KeyboardInterrupt:
-                self.logger.info("User interrupt received")
+                log_info("User interrupt received")
                 break
             except Exception as e:
-                self.logger.error(f"Error in main loop: {e}")
-                time.sleep(10)  # Wait before retrying
+                log_error(f"Error in main loop: {e}")
+                wait_for_stop(10)  # Wait before retrying
                 
         self.logger.info(f"Agent stopped. Completed {task_count} tasks.")
 
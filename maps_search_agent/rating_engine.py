@@ -4,13 +4,168 @@ Rating Engine for Maps Search Evaluation
 Implements logic from guidelines.txt for rating search results based on relevance, user intent, and data accuracy.
 """
 
+from __future__ import annotations
+
+import os
 import re
+import bisect
 import logging
+import functools
+import itertools
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
-from ocr_reader import QueryInfo, MapResult
-from pathlib import Path
+from enum import IntFlag
+
+if TYPE_CHECKING:
+    from ocr_reader import QueryInfo, MapResult
+
+
+# Precompiled patterns used on every rated result
+_DISTANCE_RE = re.compile(r'(\d+\.?\d*)\s*mi')
+_NONWORD_RE = re.compile(r'[^\w\s]')
+# translate() table deleting the ASCII characters _NONWORD_RE matches
+_NONWORD_ASCII_TABLE = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if _NONWORD_RE.match(c)))
+_NAME_ISSUE_RE = re.compile(r'(?P<unknown>\Aunknown\Z)|(?P<closed>permanently closed)', re.IGNORECASE)
+
+# Base ratings for local queries by distance bucket (upper bounds inclusive)
+_LOCAL_DISTANCE_BOUNDS = (5, 15)
+_LOCAL_DISTANCE_RATINGS = ('good', 'fair', 'poor')
+
+# (query keywords, matching result-name keywords) per category, in priority order
+_CATEGORY_RULES = tuple(
+    (re.compile('|'.join(query_words)), re.compile('|'.join(name_words), re.IGNORECASE))
+    for query_words, name_words in (
+        (('restaurant', 'food'), ('restaurant', 'cafe', 'diner', 'grill')),
+        (('gas', 'fuel'), ('gas', 'fuel', 'station', 'shell', 'bp')),
+        (('hotel', 'accommodation'), ('hotel', 'inn', 'motel', 'lodge')),
+    )
+)
+
+# Sections collected from memory.md
+_MEMORY_SECTIONS = (
+    'relevance_ratings',
+    'demotion_reasons',
+    'data_accuracy_logic',
+    'viewport_interpretation',
+    'edge_cases',
+    'closure_handling'
+)
+
+
+def _section_header_variants(name: str):
+    """Lowercased '## ' header spellings for a section, using spaces or underscores"""
+    first, *rest = name.split('_')
+    for separators in itertools.product(' _', repeat=len(rest)):
+        yield first + ''.join(sep + word for sep, word in zip(separators, rest))
+
+
+# Lowercased header text -> section name
+_MEMORY_SECTION_HEADERS = {
+    header: name for name in _MEMORY_SECTIONS for header in _section_header_variants(name)
+}
+
+# Score lost per demotion factor severity
+_SEVERITY_PENALTY = {'major': 2, 'minor': 1}
+
+# Query keyword -> user intent, checked as plain substrings of the query
+_INTENT_KEYWORDS = {
+    'specific': 'navigational', 'exact': 'navigational', 'named': 'navigational',
+    'near': 'local', 'nearby': 'local', 'closest': 'local', 'around': 'local',
+    'buy': 'transactional', 'purchase': 'transactional', 'order': 'transactional', 'book': 'transactional',
+    'what': 'informational', 'how': 'informational', 'why': 'informational', 'when': 'informational',
+}
+# Lower rank wins when a query contains keywords for several intents
+_INTENT_RANK = {'navigational': 0, 'local': 1, 'transactional': 2, 'informational': 3}
+# Zero-width lookahead so overlapping keywords are all reported in one scan
+_INTENT_RE = re.compile('(?=(' + '|'.join(map(re.escape, _INTENT_KEYWORDS)) + '))')
+
+
+def _parse_distance(distance: Optional[str]) -> Optional[float]:
+    """Parse a distance string like '2.5 mi' into miles, or None"""
+    if not distance:
+        return None
+    match = _DISTANCE_RE.search(distance)
+    return float(match.group(1)) if match else None
+
+
+def _strip_non_word(text: str) -> str:
+    """Remove characters that are neither word characters nor whitespace"""
+    text = text.translate(_NONWORD_ASCII_TABLE)
+    if not text.isascii():
+        text = _NONWORD_RE.sub('', text)
+    return text
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_exact_match(result_name: str, query: str) -> bool:
+    """Check if result name exactly matches query, ignoring case and punctuation"""
+    if not result_name or not query:
+        return False
+    
+    # Normalize both strings
+    result_clean = _strip_non_word(result_name.lower())
+    query_clean = _strip_non_word(query.lower())
+    
+    return result_clean == query_clean
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_category_match(result_name: str, query_lower: str) -> bool:
+    """Check if a result name matches the category asked for in a lowercased query"""
+    # Simple category matching, checked in priority order
+    for query_re, name_re in _CATEGORY_RULES:
+        if query_re.search(query_lower):
+            return name_re.search(result_name) is not None
+    
+    return True  # Default to match for ambiguous queries
+
+
+def _data_issue_penalty(data_issues: List[str]) -> int:
+    """Score lost to data issues; closed businesses get a major demotion"""
+    return sum(3 if 'closed' in issue.lower() else 1 for issue in data_issues)
+
+
+def _loaded_by(loader: str, name: str) -> functools.cached_property:
+    """Attribute that calls the named loader method on first access"""
+    def load(self):
+        getattr(self, loader)()
+        return self.__dict__[name]
+    return functools.cached_property(load)
+
+
+# Attributes set by RatingEngine.parse_guidelines
+_GUIDELINE_ATTRS = ('relevance_levels', 'user_intent_patterns', 'demotion_criteria', 'viewport_rules',
+                    '_check_factors')
+
+
+class Rating(IntFlag):
+    """Bit flags for rating labels, allowing group checks with a single mask"""
+    EXCELLENT = 1
+    GOOD = 2
+    FAIR = 4
+    POOR = 8
+    NOT_RELEVANT = 16
+    POSITIVE = EXCELLENT | GOOD
+    NEGATIVE = POOR | NOT_RELEVANT
+
+
+# Rating label (as stored on RatingResult.rating) -> flag
+RATING_FLAGS = {
+    'excellent': Rating.EXCELLENT,
+    'good': Rating.GOOD,
+    'fair': Rating.FAIR,
+    'poor': Rating.POOR,
+    'not_relevant': Rating.NOT_RELEVANT,
+}
+
+
+class DemotionFactor(NamedTuple):
+    """A factor that lowers a result's rating"""
+    type: str
+    severity: str
+    value: float
+    description: str
 
 
 @dataclass
@@ -27,16 +182,31 @@ class RatingResult:
 class RatingEngine:
     """Maps Search Evaluation Rating Engine"""
     
+    # One-level rating corrections used by correct_rating
+    _DEMOTE_NEXT = {'excellent': 'good', 'good': 'fair', 'fair': 'poor', 'poor': 'not_relevant'}
+    _PROMOTE_NEXT = {'not_relevant': 'poor', 'poor': 'fair', 'fair': 'good', 'good': 'excellent'}
+    
+    # Rating <-> score tables used by apply_demotions; scores run 0-4
+    _RATING_SCORES = {'excellent': 4, 'good': 3, 'fair': 2, 'poor': 1, 'not_relevant': 0}
+    _SCORE_TO_RATING = ('not_relevant', 'poor', 'fair', 'good', 'excellent')
+    
+    # Populated on first access by parse_guidelines
+    relevance_levels = _loaded_by('parse_guidelines', 'relevance_levels')
+    user_intent_patterns = _loaded_by('parse_guidelines', 'user_intent_patterns')
+    demotion_criteria = _loaded_by('parse_guidelines', 'demotion_criteria')
+    viewport_rules = _loaded_by('parse_guidelines', 'viewport_rules')
+    _check_factors = _loaded_by('parse_guidelines', '_check_factors')
+    
+    # Populated on first access by load_supporting_files
+    memory_data = _loaded_by('load_supporting_files', 'memory_data')
+    query_samples = _loaded_by('load_supporting_files', 'query_samples')
+    comment_examples = _loaded_by('load_supporting_files', 'comment_examples')
+    
     def __init__(self, guidelines_content: str):
         self.logger = logging.getLogger(__name__)
         self.guidelines_content = guidelines_content
         
-        # Parse guidelines content
-        self.parse_guidelines()
-        
-        # Load supporting files
-        self.load_supporting_files()
-        
+        # Guidelines are parsed and supporting files loaded on first use
         self.logger.info("Rating engine initialized")
     
     def parse_guidelines(self):
@@ -54,7 +224,7 @@ class RatingEngine:
         }
         
         # Extract user intent patterns from guidelines
-        self.user_intent_patterns = {
+        user_intent_patterns = {
             'navigational': [
                 r'specific\s+business\s+name',
                 r'exact\s+location',
@@ -79,6 +249,11 @@ class RatingEngine:
                 r'in\s+my\s+area'
             ]
         }
+        # Compiled once here so matching never goes through re's pattern cache
+        self.user_intent_patterns = {
+            intent: [re.compile(pattern) for pattern in patterns]
+            for intent, patterns in user_intent_patterns.items()
+        }
         
         # Extract demotion criteria
         self.demotion_criteria = {
@@ -88,7 +263,10 @@ class RatingEngine:
             },
             'prominence': {
                 'factors': ['rating', 'review_count', 'business_size'],
-                'weight': 0.3
+                'weight': 0.3,
+                'min_rating': 3.0,
+                'min_reviews': 5,
+                'severity': 'minor'
             },
             'data_accuracy': {
                 'name_mismatch': 'critical',
@@ -110,6 +288,8 @@ class RatingEngine:
             'accuracy_standards': 'high'
         }
         
+        self._check_factors = self._compile_factor_checker()
+        
         self.logger.info("Guidelines parsed successfully")
     
     def load_supporting_files(self):
@@ -118,20 +298,23 @@ class RatingEngine:
         self.query_samples = []
         self.comment_examples = []
         
+        # One directory listing instead of a stat per supporting file
+        with os.scandir('.') as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+        
         # Load memory.md if exists
-        memory_file = Path("memory.md")
-        if memory_file.exists():
+        memory_file = "memory.md"
+        if memory_file in present:
             try:
                 with open(memory_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    self.memory_data = self.parse_memory_content(content)
+                    self.memory_data = self.parse_memory_stream(f)
                     self.logger.info("Memory file loaded")
             except Exception as e:
                 self.logger.error(f"Failed to load memory file: {e}")
         
         # Load query samples if exists
-        query_file = Path("query_samples.txt")
-        if query_file.exists():
+        query_file = "query_samples.txt"
+        if query_file in present:
             try:
                 with open(query_file, 'r', encoding='utf-8') as f:
                     self.query_samples = [line.strip() for line in f if line.strip()]
@@ -140,8 +323,8 @@ class RatingEngine:
                 self.logger.error(f"Failed to load query samples: {e}")
         
         # Load comment examples if exists
-        comment_file = Path("comments_examples.txt")
-        if comment_file.exists():
+        comment_file = "comments_examples.txt"
+        if comment_file in present:
             try:
                 with open(comment_file, 'r', encoding='utf-8') as f:
                     self.comment_examples = [line.strip() for line in f if line.strip()]
@@ -151,23 +334,20 @@ class RatingEngine:
     
     def parse_memory_content(self, content: str) -> Dict[str, Any]:
         """Parse memory.md content into structured data"""
-        sections = {
-            'relevance_ratings': [],
-            'demotion_reasons': [],
-            'data_accuracy_logic': [],
-            'viewport_interpretation': [],
-            'edge_cases': [],
-            'closure_handling': []
-        }
+        return self.parse_memory_stream(content.split('\n'))
+    
+    def parse_memory_stream(self, lines: Iterable[str]) -> Dict[str, Any]:
+        """Parse memory.md lines (e.g. an open file) into structured data"""
+        sections = {name: [] for name in _MEMORY_SECTIONS}
         
         current_section = None
         
-        for line in content.split('\n'):
+        for line in lines:
             line = line.strip()
             
             if line.startswith('## '):
-                section_name = line[3:].lower().replace(' ', '_')
-                if section_name in sections:
+                section_name = _MEMORY_SECTION_HEADERS.get(line[3:].lower())
+                if section_name:
                     current_section = section_name
             elif current_section and line and not line.startswith('#'):
                 sections[current_section].append(line)
@@ -186,20 +366,26 @@ class RatingEngine:
                 demotion_reason='No results'
             )
         
+        # Lowercase the query once and share it with every helper
+        query_lower = query_info.query.lower()
+        
         # Analyze user intent
-        user_intent = self.analyze_user_intent(query_info)
+        user_intent = self.analyze_user_intent(query_info, query_lower)
         
         # Evaluate top result (most important)
         top_result = map_results[0]
         
+        # Parse the distance once for both demotion and base rating checks
+        distance_miles = _parse_distance(top_result.distance)
+        
         # Check for data accuracy issues
         data_issues = self.check_data_accuracy(top_result, query_info)
         
         # Check for demotion factors
-        demotion_factors = self.check_demotion_factors(top_result, query_info)
+        demotion_factors = self.check_demotion_factors(top_result, query_info, distance_miles)
         
         # Calculate base rating
-        base_rating = self.calculate_base_rating(top_result, query_info, user_intent)
+        base_rating = self.calculate_base_rating(top_result, query_info, user_intent, query_lower, distance_miles)
         
         # Apply demotions
         final_rating = self.apply_demotions(base_rating, demotion_factors, data_issues)
@@ -219,35 +405,43 @@ class RatingEngine:
             user_intent_match=user_intent
         )
     
-    def analyze_user_intent(self, query_info: QueryInfo) -> str:
+    def evaluate_batch(self, query_infos: List[QueryInfo],
+                       map_results_list: List[List[MapResult]]) -> List[RatingResult]:
+        """Evaluate many queries at once"""
+        self.logger.info(f"Evaluating batch of {len(query_infos)} queries")
+        evaluate_results = self.evaluate_results
+        return [evaluate_results(query_info, map_results)
+                for query_info, map_results in zip(query_infos, map_results_list)]
+    
+    def analyze_user_intent(self, query_info: QueryInfo, query_lower: Optional[str] = None) -> str:
         """Analyze user intent from query"""
-        query_lower = query_info.query.lower()
-        
-        # Check for navigational intent
-        if any(pattern in query_lower for pattern in ['specific', 'exact', 'named']):
-            return 'navigational'
-        
-        # Check for local intent
-        if any(word in query_lower for word in ['near', 'nearby', 'closest', 'around']):
-            return 'local'
-        
-        # Check for transactional intent
-        if any(word in query_lower for word in ['buy', 'purchase', 'order', 'book']):
-            return 'transactional'
-        
-        # Check for informational intent
-        if any(word in query_lower for word in ['what', 'how', 'why', 'when']):
-            return 'informational'
+        if query_lower is None:
+            query_lower = query_info.query.lower()
+        
+        # Single scan for all intent keywords, keeping the highest-priority intent
+        best_intent = None
+        best_rank = len(_INTENT_RANK)
+        for match in _INTENT_RE.finditer(query_lower):
+            intent = _INTENT_KEYWORDS[match.group(1)]
+            rank = _INTENT_RANK[intent]
+            if rank < best_rank:
+                if rank == 0:
+                    return intent
+                best_intent, best_rank = intent, rank
         
         # Default to local for most map searches
-        return 'local'
+        return best_intent or 'local'
     
     def check_data_accuracy(self, result: MapResult, query_info: QueryInfo) -> List[str]:
         """Check for data accuracy issues"""
         issues = []
         
+        # One scan of the name covers both the placeholder and closure checks
+        name_match = _NAME_ISSUE_RE.search(result.name) if result.name else None
+        name_issue = name_match.lastgroup if name_match else None
+        
         # Check name accuracy
-        if not result.name or result.name.lower() == 'unknown':
+        if not result.name or name_issue == 'unknown':
             issues.append('Missing or unclear business name')
         
         # Check address accuracy
@@ -259,49 +453,52 @@ class RatingEngine:
             issues.append('Invalid rating value')
         
         # Check for outdated information indicators
-        if 'permanently closed' in str(result.name).lower():
+        if name_issue == 'closed':
             issues.append('Business appears permanently closed')
         
         return issues
     
-    def check_demotion_factors(self, result: MapResult, query_info: QueryInfo) -> List[Dict[str, Any]]:
+    def check_demotion_factors(self, result: MapResult, query_info: QueryInfo,
+                               distance_miles: Optional[float] = None) -> List[DemotionFactor]:
         """Check for factors that should demote the rating"""
-        factors = []
-        
-        # Distance-based demotion
-        if result.distance:
-            distance_match = re.search(r'(\d+\.?\d*)\s*mi', result.distance)
-            if distance_match:
-                distance_miles = float(distance_match.group(1))
-                if distance_miles > self.demotion_criteria['distance']['threshold_miles']:
-                    factors.append({
-                        'type': 'distance',
-                        'severity': 'major',
-                        'value': distance_miles,
-                        'description': f'Result is {distance_miles} miles away'
-                    })
-        
-        # Prominence-based demotion
-        if result.rating and result.rating < 3.0:
-            factors.append({
-                'type': 'low_rating',
-                'severity': 'minor',
-                'value': result.rating,
-                'description': f'Low rating: {result.rating}'
-            })
-        
-        # Review count demotion
-        if result.reviews_count and result.reviews_count < 5:
-            factors.append({
-                'type': 'low_reviews',
-                'severity': 'minor',
-                'value': result.reviews_count,
-                'description': f'Very few reviews: {result.reviews_count}'
-            })
-        
-        return factors
+        if distance_miles is None:
+            distance_miles = _parse_distance(result.distance)
+        
+        return self._check_factors(result, distance_miles)
     
-    def calculate_base_rating(self, result: MapResult, query_info: QueryInfo, user_intent: str) -> str:
+    def _compile_factor_checker(self):
+        """Build the demotion factor check with the parsed thresholds bound as closure constants"""
+        distance_threshold = self.demotion_criteria['distance']['threshold_miles']
+        distance_severity = self.demotion_criteria['distance']['severity']
+        min_rating = self.demotion_criteria['prominence']['min_rating']
+        min_reviews = self.demotion_criteria['prominence']['min_reviews']
+        prominence_severity = self.demotion_criteria['prominence']['severity']
+        
+        def check(result: MapResult, distance_miles: Optional[float]) -> List[DemotionFactor]:
+            factors = []
+            
+            # Distance-based demotion
+            if distance_miles is not None and distance_miles > distance_threshold:
+                factors.append(DemotionFactor('distance', distance_severity, distance_miles,
+                                              f'Result is {distance_miles} miles away'))
+            
+            # Prominence-based demotion
+            if result.rating and result.rating < min_rating:
+                factors.append(DemotionFactor('low_rating', prominence_severity, result.rating,
+                                              f'Low rating: {result.rating}'))
+            
+            # Review count demotion
+            if result.reviews_count and result.reviews_count < min_reviews:
+                factors.append(DemotionFactor('low_reviews', prominence_severity, result.reviews_count,
+                                              f'Very few reviews: {result.reviews_count}'))
+            
+            return factors
+        
+        return check
+    
+    def calculate_base_rating(self, result: MapResult, query_info: QueryInfo, user_intent: str,
+                              query_lower: Optional[str] = None,
+                              distance_miles: Optional[float] = None) -> str:
         """Calculate base rating before applying demotions"""
         
         # For navigational queries, exact matches should be excellent
@@ -313,107 +510,60 @@ class RatingEngine:
         
         # For local queries, proximity and relevance matter
         if user_intent == 'local':
-            if result.distance and 'mi' in result.distance:
-                distance_match = re.search(r'(\d+\.?\d*)\s*mi', result.distance)
-                if distance_match:
-                    distance = float(distance_match.group(1))
-                    if distance <= 5:
-                        return 'good'
-                    elif distance <= 15:
-                        return 'fair'
-                    else:
-                        return 'poor'
+            if distance_miles is None:
+                distance_miles = _parse_distance(result.distance)
+            if distance_miles is not None:
+                # <= 5 mi is good, <= 15 mi fair, anything further poor
+                return _LOCAL_DISTANCE_RATINGS[bisect.bisect_left(_LOCAL_DISTANCE_BOUNDS, distance_miles)]
         
         # Default rating based on general relevance
-        if self.is_category_match(result, query_info):
+        if self.is_category_match(result, query_info, query_lower):
             return 'good'
         else:
             return 'fair'
     
     def is_exact_match(self, result_name: str, query: str) -> bool:
         """Check if result name exactly matches query"""
-        if not result_name or not query:
-            return False
-        
-        # Normalize both strings
-        result_clean = re.sub(r'[^\w\s]', '', result_name.lower())
-        query_clean = re.sub(r'[^\w\s]', '', query.lower())
-        
-        return result_clean == query_clean
+        return _is_exact_match(result_name, query)
     
-    def is_category_match(self, result: MapResult, query_info: QueryInfo) -> bool:
+    def is_category_match(self, result: MapResult, query_info: QueryInfo, query_lower: Optional[str] = None) -> bool:
         """Check if result matches query category"""
-        query_lower = query_info.query.lower()
-        
-        # Simple category matching
-        if 'restaurant' in query_lower or 'food' in query_lower:
-            return any(word in result.name.lower() for word in ['restaurant', 'cafe', 'diner', 'grill'])
-        
-        if 'gas' in query_lower or 'fuel' in query_lower:
-            return any(word in result.name.lower() for word in ['gas', 'fuel', 'station', 'shell', 'bp'])
-        
-        if 'hotel' in query_lower or 'accommodation' in query_lower:
-            return any(word in result.name.lower() for word in ['hotel', 'inn', 'motel', 'lodge'])
-        
-        return True  # Default to match for ambiguous queries
+        if query_lower is None:
+            query_lower = query_info.query.lower()
+        return _is_category_match(result.name, query_lower)
     
-    def apply_demotions(self, base_rating: str, demotion_factors: List[Dict], data_issues: List[str]) -> str:
+    def apply_demotions(self, base_rating: str, demotion_factors: List[DemotionFactor], data_issues: List[str]) -> str:
         """Apply demotions to base rating"""
-        rating_scores = {
-            'excellent': 4,
-            'good': 3,
-            'fair': 2,
-            'poor': 1,
-            'not_relevant': 0
-        }
+        current_score = self._RATING_SCORES.get(base_rating, 2)
         
-        score_to_rating = {v: k for k, v in rating_scores.items()}
-        
-        current_score = rating_scores.get(base_rating, 2)
-        
-        # Apply demotion factors
-        for factor in demotion_factors:
-            if factor['severity'] == 'major':
-                current_score -= 2
-            elif factor['severity'] == 'minor':
-                current_score -= 1
-        
-        # Apply data issue demotions
-        for issue in data_issues:
-            if 'closed' in issue.lower():
-                current_score -= 3  # Major demotion for closed businesses
-            else:
-                current_score -= 1
+        # Apply demotion factors and data issue demotions
+        current_score -= sum(_SEVERITY_PENALTY.get(factor.severity, 0) for factor in demotion_factors)
+        current_score -= _data_issue_penalty(data_issues)
         
         # Ensure score is within bounds
         current_score = max(0, min(4, current_score))
         
-        return score_to_rating.get(current_score, 'fair')
+        return self._SCORE_TO_RATING[current_score]
     
-    def generate_reasoning(self, query_info: QueryInfo, result: MapResult, user_intent: str, demotion_factors: List[Dict]) -> str:
+    def generate_reasoning(self, query_info: QueryInfo, result: MapResult, user_intent: str, demotion_factors: List[DemotionFactor]) -> str:
         """Generate reasoning for the rating decision"""
-        reasoning_parts = []
-        
-        reasoning_parts.append(f"Query: '{query_info.query}' - {user_intent} intent")
-        reasoning_parts.append(f"Top result: {result.name}")
+        address_part = f" | Address: {result.address}" if result.address else ""
+        rating_part = f" | Rating: {result.rating}/5" if result.rating else ""
+        distance_part = f" | Distance: {result.distance}" if result.distance else ""
+        reasoning = (f"Query: '{query_info.query}' - {user_intent} intent | Top result: {result.name}"
+                     f"{address_part}{rating_part}{distance_part}")
         
-        if result.address:
-            reasoning_parts.append(f"Address: {result.address}")
+        # Most results carry no demotion factors, so only build the list when needed
+        if not demotion_factors:
+            return reasoning
         
-        if result.rating:
-            reasoning_parts.append(f"Rating: {result.rating}/5")
-        
-        if result.distance:
-            reasoning_parts.append(f"Distance: {result.distance}")
-        
-        if demotion_factors:
-            reasoning_parts.append("Demotion factors:")
-            for factor in demotion_factors:
-                reasoning_parts.append(f"- {factor['description']}")
+        reasoning_parts = [reasoning, "Demotion factors:"]
+        for factor in demotion_factors:
+            reasoning_parts.append(f"- {factor.description}")
         
         return " | ".join(reasoning_parts)
     
-    def determine_demotion_reason(self, demotion_factors: List[Dict], data_issues: List[str]) -> Optional[str]:
+    def determine_demotion_reason(self, demotion_factors: List[DemotionFactor], data_issues: List[str]) -> Optional[str]:
         """Determine primary demotion reason"""
         if not demotion_factors and not data_issues:
             return None
@@ -425,19 +575,19 @@ class RatingEngine:
         
         # Check for major demotion factors
         for factor in demotion_factors:
-            if factor['severity'] == 'major':
-                return factor['description']
+            if factor.severity == 'major':
+                return factor.description
         
         # Return first minor issue
         if demotion_factors:
-            return demotion_factors[0]['description']
+            return demotion_factors[0].description
         
         if data_issues:
             return data_issues[0]
         
         return None
     
-    def calculate_confidence(self, rating: str, demotion_factors: List[Dict]) -> float:
+    def calculate_confidence(self, rating: str, demotion_factors: List[DemotionFactor]) -> float:
         """Calculate confidence score for the rating"""
         base_confidence = 0.8
         
@@ -458,19 +608,15 @@ class RatingEngine:
         self.logger.info(f"Correcting rating based on feedback: {validation_feedback}")
         
         # Apply corrections based on feedback
-        if 'rating_too_high' in validation_feedback.get('issues', []):
+        issues = validation_feedback.get('issues', [])
+        
+        if 'rating_too_high' in issues:
             # Demote rating by one level
-            rating_order = ['excellent', 'good', 'fair', 'poor', 'not_relevant']
-            current_index = rating_order.index(rating_result.rating)
-            if current_index < len(rating_order) - 1:
-                rating_result.rating = rating_order[current_index + 1]
+            rating_result.rating = self._DEMOTE_NEXT.get(rating_result.rating, rating_result.rating)
         
-        if 'rating_too_low' in validation_feedback.get('issues', []):
+        if 'rating_too_low' in issues:
             # Promote rating by one level
-            rating_order = ['not_relevant', 'poor', 'fair', 'good', 'excellent']
-            current_index = rating_order.index(rating_result.rating)
-            if current_index < len(rating_order) - 1:
-                rating_result.rating = rating_order[current_index + 1]
+            rating_result.rating = self._PROMOTE_NEXT.get(rating_result.rating, rating_result.rating)
         
         # Adjust confidence based on correction
         rating_result.confidence *= 0.8
@@ -487,14 +633,21 @@ class RatingEngine:
             'total_ratings': 0,
             'rating_distribution': {},
             'common_demotion_reasons': [],
-            'average_confidence': 0.0
+            'average_confidence': 0.0,
+            'match_cache': {
+                'exact_match': _is_exact_match.cache_info()._asdict(),
+                'category_match': _is_category_match.cache_info()._asdict()
+            }
         }
     
     def update_guidelines(self, new_guidelines: str):
         """Update guidelines and reparse"""
         self.guidelines_content = new_guidelines
-        self.parse_guidelines()
-        self.logger.info("Guidelines updated and reparsed")
+        
+        # Drop parsed criteria so they are rebuilt from the new text on next use
+        for name in _GUIDELINE_ATTRS:
+            self.__dict__.pop(name, None)
+        self.logger.info("Guidelines updated; criteria will be reparsed on next use")
     
     def debug_rating_decision(self, query_info: QueryInfo, map_results: List[MapResult]) -> Dict[str, Any]:
         """Debug rating decision process"""
@@ -509,6 +662,8 @@ class RatingEngine:
         if map_results:
             top_result = map_results[0]
             debug_info['data_accuracy_issues'] = self.check_data_accuracy(top_result, query_info)
-            debug_info['demotion_factors'] = self.check_demotion_factors(top_result, query_info)
+            debug_info['demotion_factors'] = [
+                factor._asdict() for factor in self.check_demotion_factors(top_result, query_info)
+            ]
         
         return debug_info
\ No newline at end of file
@@ -5,6 +5,7 @@ Setup script for Maps Search Evaluation Agent
 
 import os
 import sys
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -20,7 +21,12 @@ def install_requirements():
     """Install required packages"""
     print("\n📦 Installing Python packages...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # uv resolves and installs much faster than a pip subprocess when available
+        uv = shutil.which("uv")
+        if uv:
+            subprocess.check_call([uv, "pip", "install", "--python", sys.executable, "-r", "requirements.txt"])
+        else:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
         print("✅ Python packages installed successfully")
         return True
     except subprocess.CalledProcessError:
@@ -9,12 +9,14 @@ import random
 import math
 import pyautogui
 import numpy as np
-from typing import Tuple, List, Optional
+from typing import Tuple, Optional
 import logging
 from dataclasses import dataclass
 
+from random_pool import UniformPool
 
-@dataclass
+
+@dataclass(frozen=True)
 class MouseProfile:
     """Human-like mouse behavior profile"""
     base_speed: float = 0.5
@@ -25,14 +27,36 @@ class MouseProfile:
     deceleration_factor: float = 0.8
 
 
+# Profiles are immutable, so controllers share a single default instance
+DEFAULT_MOUSE_PROFILE = MouseProfile()
+
+
 class MouseController:
     """Advanced mouse controller with human-like behavior"""
     
+    # Number of uniforms drawn per refill of the random pool
+    RANDOM_POOL_SIZE = 65536
+    
+    __slots__ = (
+        'logger', 'profile', '_jitter_amp', '_random', '_bez_weights',
+        'screen_width', 'screen_height', 'last_position', '_lo', '_hi',
+        'ui_zones', '_zone_keys', '_zone_xy',
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.profile = MouseProfile()
+        self.profile = DEFAULT_MOUSE_PROFILE
+        self._jitter_amp = int(self.profile.jitter_factor * 10)
+        self._random = UniformPool(self.RANDOM_POOL_SIZE)
+        
+        # Bernstein weights for common path resolutions, shape (N, 4)
+        self._bez_weights = {n: self._bernstein_weights(n) for n in (8, 16, 32)}
+        
         self.screen_width, self.screen_height = pyautogui.size()
-        self.last_position = pyautogui.position()
+        # Tracked cursor position; moves update it so hot paths skip querying the OS
+        self.last_position = tuple(pyautogui.position())
+        self._lo = np.zeros(2, dtype=np.int32)
+        self._hi = np.array([self.screen_width, self.screen_height], dtype=np.int32)
         
         # Disable pyautogui failsafe for autonomous operation
         pyautogui.FAILSAFE = False
@@ -46,71 +70,82 @@ class MouseController:
             'sidebar': (300, self.screen_height // 2),
             'top_bar': (self.screen_width // 2, 50),
         }
+        self._zone_keys = tuple(self.ui_zones)
+        self._zone_xy = np.array(list(self.ui_zones.values()), dtype=np.int32)
         
         self.logger.info("Mouse controller initialized")
     
+    @staticmethod
+    def _bernstein_weights(n: int) -> np.ndarray:
+        """Cubic Bernstein basis sampled at n evenly spaced points"""
+        t = np.linspace(0, 1, n)
+        mt = 1 - t
+        return np.column_stack((mt**3, 3*mt**2*t, 3*mt*t**2, t**3))
+    
     def _calculate_bezier_curve(self, start: Tuple[int, int], end: Tuple[int, int], 
-                              control_points: int = 3) -> List[Tuple[int, int]]:
-        """Generate smooth bezier curve path between two points"""
-        points = []
-        
+                              control_points: int = 16) -> np.ndarray:
+        """Generate smooth bezier curve path between two points as an (N, 2) array"""
         # Generate random control points for natural curve
         mid_x = (start[0] + end[0]) // 2
         mid_y = (start[1] + end[1]) // 2
         
         # Add some randomness to control points
-        ctrl1_x = mid_x + random.randint(-100, 100)
-        ctrl1_y = mid_y + random.randint(-50, 50)
+        ctrl1_x = mid_x + self._random.randint(-100, 100)
+        ctrl1_y = mid_y + self._random.randint(-50, 50)
         
-        ctrl2_x = mid_x + random.randint(-100, 100)
-        ctrl2_y = mid_y + random.randint(-50, 50)
+        ctrl2_x = mid_x + self._random.randint(-100, 100)
+        ctrl2_y = mid_y + self._random.randint(-50, 50)
         
-        # Calculate bezier curve points
-        for i in range(control_points):
-            t = i / (control_points - 1)
-            
-            # Cubic bezier formula
-            x = (1-t)**3 * start[0] + 3*(1-t)**2*t * ctrl1_x + 3*(1-t)*t**2 * ctrl2_x + t**3 * end[0]
-            y = (1-t)**3 * start[1] + 3*(1-t)**2*t * ctrl1_y + 3*(1-t)*t**2 * ctrl2_y + t**3 * end[1]
-            
-            points.append((int(x), int(y)))
+        # Evaluate the cubic bezier formula as a single weighted sum
+        weights = self._bez_weights.get(control_points)
+        if weights is None:
+            weights = self._bez_weights[control_points] = self._bernstein_weights(control_points)
         
-        return points
+        control = np.array([start, (ctrl1_x, ctrl1_y), (ctrl2_x, ctrl2_y), end], dtype=np.float64)
+        return (weights @ control).astype(np.int32)
     
     def _add_jitter(self, x: int, y: int) -> Tuple[int, int]:
         """Add human-like jitter to coordinates"""
-        jitter_x = random.randint(-int(self.profile.jitter_factor * 10), 
-                                 int(self.profile.jitter_factor * 10))
-        jitter_y = random.randint(-int(self.profile.jitter_factor * 10), 
-                                 int(self.profile.jitter_factor * 10))
+        jitter_x = self._random.randint(-self._jitter_amp, self._jitter_amp)
+        jitter_y = self._random.randint(-self._jitter_amp, self._jitter_amp)
         
         return (x + jitter_x, y + jitter_y)
     
     def _human_like_move(self, target_x: int, target_y: int, duration: float = None):
         """Move mouse with human-like behavior"""
-        current_x, current_y = pyautogui.position()
+        current_x, current_y = self.last_position
         
         # Calculate distance for speed adjustment
         distance = math.sqrt((target_x - current_x)**2 + (target_y - current_y)**2)
         
         if duration is None:
             # Base duration on distance with some randomness
-            duration = (distance / 1000) * self.profile.base_speed + random.uniform(0.1, 0.3)
+            duration = (distance / 1000) * self.profile.base_speed + self._random.uniform(0.1, 0.3)
         
         # Generate smooth path
         path_points = self._calculate_bezier_curve((current_x, current_y), (target_x, target_y))
         
-        # Move along the path
-        for i, (x, y) in enumerate(path_points):
-            # Add jitter
-            jittered_x, jittered_y = self._add_jitter(x, y)
-            
-            # Move to point
-            pyautogui.moveTo(jittered_x, jittered_y, duration=duration/len(path_points))
+        # Jitter the whole path with a single draw
+        jitter = self._jitter_amp
+        path_points += self._random.rng.integers(-jitter, jitter + 1, size=path_points.shape, dtype=np.int32)
+        self._clamp_points(path_points)
+        
+        # Move along the path at a fixed cadence instead of tweening each segment
+        step = duration / len(path_points)
+        deadline = time.perf_counter()
+        for x, y in path_points.tolist():
+            pyautogui.moveTo(x, y, _pause=False)
             
-            # Random micro-pauses
-            if random.random() < self.profile.pause_probability:
-                time.sleep(random.uniform(0.01, 0.05))
+            deadline += step
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+        
+        # One hesitation pause instead of per-point micro-sleeps, skipped when
+        # it would fall below timer resolution
+        pause_budget = duration * self.profile.pause_probability
+        if pause_budget >= 0.01:
+            time.sleep(pause_budget)
         
         # Final position adjustment
         final_x, final_y = self._add_jitter(target_x, target_y)
@@ -123,38 +158,36 @@ class MouseController:
         self.logger.info("Performing random screen movement")
         
         # Choose random UI zone to explore
-        zone_name = random.choice(list(self.ui_zones.keys()))
-        zone_x, zone_y = self.ui_zones[zone_name]
+        zone_index = self._random.randint(0, len(self._zone_keys) - 1)
         
         # Add randomness to the zone coordinates
-        target_x = zone_x + random.randint(-100, 100)
-        target_y = zone_y + random.randint(-50, 50)
+        target = self._zone_xy[zone_index] + (self._random.randint(-100, 100), self._random.randint(-50, 50))
         
         # Ensure coordinates are within screen bounds
-        target_x = max(50, min(self.screen_width - 50, target_x))
-        target_y = max(50, min(self.screen_height - 50, target_y))
+        self._clamp_points(target, margin=50)
+        target_x, target_y = target.tolist()
         
         # Move to random position
         self._human_like_move(target_x, target_y)
         
         # Random pause
-        time.sleep(random.uniform(0.5, 2.0))
+        time.sleep(self._random.uniform(0.5, 2.0))
         
         # Sometimes scroll around
-        if random.random() < 0.6:
+        if self._random.uniform(0, 1) < 0.6:
             self._random_scroll()
     
     def _random_scroll(self):
         """Perform random scrolling behavior"""
-        scroll_actions = random.randint(1, 3)
+        scroll_actions = self._random.randint(1, 3)
         
         for _ in range(scroll_actions):
             # Random scroll direction and amount
             scroll_direction = random.choice([-1, 1])
-            scroll_amount = random.randint(1, 5)
+            scroll_amount = self._random.randint(1, 5)
             
             pyautogui.scroll(scroll_direction * scroll_amount)
-            time.sleep(random.uniform(0.2, 0.8))
+            time.sleep(self._random.uniform(0.2, 0.8))
     
     def idle_behavior(self):
         """Simulate idle human behavior"""
@@ -171,15 +204,13 @@ class MouseController:
     
     def _micro_movement(self):
         """Small random movements"""
-        current_x, current_y = pyautogui.position()
+        current = np.array(self.last_position, dtype=np.int32)
         
         # Small random movement
-        new_x = current_x + random.randint(-20, 20)
-        new_y = current_y + random.randint(-20, 20)
+        target = current + (self._random.randint(-20, 20), self._random.randint(-20, 20))
         
         # Ensure within screen bounds
-        new_x = max(0, min(self.screen_width, new_x))
-        new_y = max(0, min(self.screen_height, new_y))
+        new_x, new_y = self._clamp_points(target).tolist()
         
         self._human_like_move(new_x, new_y, duration=0.5)
     
@@ -190,31 +221,29 @@ class MouseController:
         
         if zone in self.ui_zones:
             zone_x, zone_y = self.ui_zones[zone]
-            target_x = zone_x + random.randint(-50, 50)
-            target_y = zone_y + random.randint(-25, 25)
+            target_x = zone_x + self._random.randint(-50, 50)
+            target_y = zone_y + self._random.randint(-25, 25)
             
             self._human_like_move(target_x, target_y)
-            time.sleep(random.uniform(1.0, 3.0))
+            time.sleep(self._random.uniform(1.0, 3.0))
     
     def _brief_scroll(self):
         """Brief scrolling behavior"""
-        scroll_count = random.randint(1, 2)
+        scroll_count = self._random.randint(1, 2)
         for _ in range(scroll_count):
             direction = random.choice([-1, 1])
-            pyautogui.scroll(direction * random.randint(1, 3))
-            time.sleep(random.uniform(0.3, 0.7))
+            pyautogui.scroll(direction * self._random.randint(1, 3))
+            time.sleep(self._random.uniform(0.3, 0.7))
     
     def _zone_exploration(self):
         """Explore different UI zones"""
-        zones = random.sample(list(self.ui_zones.keys()), 2)
+        zone_indices = random.sample(range(len(self._zone_keys)), 2)
+        offsets = [(self._random.randint(-30, 30), self._random.randint(-20, 20)) for _ in zone_indices]
+        targets = self._zone_xy[zone_indices] + offsets
         
-        for zone in zones:
-            zone_x, zone_y = self.ui_zones[zone]
-            target_x = zone_x + random.randint(-30, 30)
-            target_y = zone_y + random.randint(-20, 20)
-            
+        for target_x, target_y in targets.tolist():
             self._human_like_move(target_x, target_y)
-            time.sleep(random.uniform(0.5, 1.5))
+            time.sleep(self._random.uniform(0.5, 1.5))
     
     def submit_rating(self, rating: str):
         """Submit rating with human-like interaction"""
@@ -225,13 +254,13 @@ class MouseController:
         self._human_like_move(rating_x, rating_y)
         
         # Pause before clicking
-        time.sleep(random.uniform(0.3, 0.8))
+        time.sleep(self._random.uniform(0.3, 0.8))
         
         # Click rating button (simulated)
         pyautogui.click()
         
         # Brief pause after click
-        time.sleep(random.uniform(0.2, 0.5))
+        time.sleep(self._random.uniform(0.2, 0.5))
         
     def random_post_task_behavior(self):
         """Random behavior after completing a task"""
@@ -245,7 +274,7 @@ class MouseController:
         ]
         
         # Execute 1-2 random behaviors
-        selected_behaviors = random.sample(behaviors, random.randint(1, 2))
+        selected_behaviors = random.sample(behaviors, self._random.randint(1, 2))
         for behavior in selected_behaviors:
             behavior()
     
@@ -254,15 +283,15 @@ class MouseController:
         map_x, map_y = self.ui_zones['map_center']
         
         # Visit several points around the map
-        for _ in range(random.randint(2, 4)):
-            offset_x = random.randint(-200, 200)
-            offset_y = random.randint(-150, 150)
+        for _ in range(self._random.randint(2, 4)):
+            offset_x = self._random.randint(-200, 200)
+            offset_y = self._random.randint(-150, 150)
             
             target_x = map_x + offset_x
             target_y = map_y + offset_y
             
             self._human_like_move(target_x, target_y)
-            time.sleep(random.uniform(0.5, 1.2))
+            time.sleep(self._random.uniform(0.5, 1.2))
     
     def _check_other_results(self):
         """Check other search results"""
@@ -270,43 +299,43 @@ class MouseController:
         
         # Scroll through results
         self._human_like_move(sidebar_x, sidebar_y)
-        time.sleep(random.uniform(0.3, 0.6))
+        time.sleep(self._random.uniform(0.3, 0.6))
         
         # Simulate checking multiple results
-        for _ in range(random.randint(2, 5)):
+        for _ in range(self._random.randint(2, 5)):
             pyautogui.scroll(-1)
-            time.sleep(random.uniform(0.4, 0.8))
+            time.sleep(self._random.uniform(0.4, 0.8))
     
     def _brief_pause(self):
         """Brief thinking pause"""
-        time.sleep(random.uniform(1.0, 3.0))
+        time.sleep(self._random.uniform(1.0, 3.0))
     
     def _scroll_exploration(self):
         """Explore by scrolling"""
-        scroll_actions = random.randint(3, 6)
+        scroll_actions = self._random.randint(3, 6)
         
         for _ in range(scroll_actions):
             direction = random.choice([-1, 1])
-            amount = random.randint(1, 3)
+            amount = self._random.randint(1, 3)
             
             pyautogui.scroll(direction * amount)
-            time.sleep(random.uniform(0.3, 0.7))
+            time.sleep(self._random.uniform(0.3, 0.7))
     
     def simulate_window_interaction(self):
         """Simulate window switching or focus changes"""
         self.logger.info("Simulating window interaction")
         
         # Simulate Alt+Tab or similar
-        current_pos = pyautogui.position()
+        current_pos = self.last_position
         
         # Move away briefly
         self._human_like_move(
-            random.randint(100, self.screen_width - 100),
-            random.randint(100, self.screen_height - 100)
+            self._random.randint(100, self.screen_width - 100),
+            self._random.randint(100, self.screen_height - 100)
         )
         
         # Pause (simulating focus loss)
-        time.sleep(random.uniform(2.0, 5.0))
+        time.sleep(self._random.uniform(2.0, 5.0))
         
         # Return to original area
         self._human_like_move(current_pos[0], current_pos[1])
@@ -315,11 +344,21 @@ class MouseController:
         """Emergency stop for the mouse controller"""
         self.logger.warning("Emergency stop activated")
         pyautogui.FAILSAFE = True
+        self.resync_position()
         
+    def resync_position(self) -> Tuple[int, int]:
+        """Re-read the real cursor position, e.g. after user intervention"""
+        self.last_position = tuple(pyautogui.position())
+        return self.last_position
+    
     def get_current_position(self) -> Tuple[int, int]:
         """Get current mouse position"""
         return pyautogui.position()
     
     def is_position_valid(self, x: int, y: int) -> bool:
         """Check if position is within screen bounds"""
-        return 0 <= x <= self.screen_width and 0 <= y <= self.screen_height
\ No newline at end of file
+        return 0 <= x <= self.screen_width and 0 <= y <= self.screen_height
+    
+    def _clamp_points(self, points: np.ndarray, margin: int = 0) -> np.ndarray:
+        """Clamp a point or (N, 2) point array to screen bounds in place"""
+        return np.clip(points, self._lo + margin, self._hi - margin, out=points)
\ No newline at end of file
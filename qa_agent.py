@@ -1,11 +1,17 @@
+import re
 import time
 import logging
+from collections import deque
+
+from rating_engine import Rating, RATING_FLAGS
 
 
 class QAAgent:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.validation_history = []
+        self.validation_history = deque(maxlen=10000)
+        # Substring match, as before: 'badly' and 'poorly' count as negative too
+        self._neg_re = re.compile(r'poor|bad|terrible|awful', re.IGNORECASE)
         self.logger.info("QA Agent initialized")
     
     def validate_rating_comment(self, rating_result, comment):
@@ -17,9 +23,9 @@ class QAAgent:
         }
         
         # Check rating-comment consistency
-        if rating_result.rating in ['excellent', 'good'] and comment:
-            negative_words = ['poor', 'bad', 'terrible', 'awful']
-            if any(word in comment.lower() for word in negative_words):
+        rating_flag = RATING_FLAGS.get(rating_result.rating, 0)
+        if rating_flag & Rating.POSITIVE and comment:
+            if self._neg_re.search(comment):
                 validation_result['valid'] = False
                 validation_result['issues'].append('rating_comment_mismatch')
                 validation_result['reason'] = 'Positive rating with negative comment'
@@ -41,7 +47,7 @@ class QAAgent:
         if rating_result.rating == 'excellent' and rating_result.confidence < 0.9:
             suggestions.append("Consider stronger justification for excellent rating")
         
-        if not comment and rating_result.rating in ['poor', 'not_relevant']:
+        if not comment and RATING_FLAGS.get(rating_result.rating, 0) & Rating.NEGATIVE:
             suggestions.append("Add explanatory comment for low rating")
         
         return suggestions
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Pooled random numbers for the agent's humanization delays and jitter.
+Draws uniforms from NumPy in batches so per-call sampling is a list index.
+"""
+
+import numpy as np
+
+
+class UniformPool:
+    """Batch-drawn source of uniform floats and inclusive random ints"""
+    
+    __slots__ = ('rng', 'size', '_pool', '_idx')
+    
+    def __init__(self, size: int):
+        self.rng = np.random.default_rng()
+        self.size = size
+        self._refill()
+    
+    def _refill(self):
+        """Draw a fresh batch of uniforms in [0, 1)"""
+        self._pool = self.rng.random(self.size).tolist()
+        self._idx = 0
+    
+    def uniform(self, low: float, high: float) -> float:
+        """Pooled equivalent of random.uniform"""
+        if self._idx >= self.size:
+            self._refill()
+        u = self._pool[self._idx]
+        self._idx += 1
+        return low + (high - low) * u
+    
+    def randint(self, low: int, high: int) -> int:
+        """Pooled equivalent of random.randint (inclusive bounds)"""
+        return low + int(self.uniform(0, high - low + 1))
@@ -7,13 +7,14 @@ Enforces 24±3 tasks per hour with randomized pauses and longer breaks.
 import time
 import random
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import threading
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
 from collections import deque
 
+from random_pool import UniformPool
 
-@dataclass
-class TaskRecord:
+
+class TaskRecord(NamedTuple):
     """Record of a completed task"""
     timestamp: float
     duration: float
@@ -23,6 +24,8 @@ class TaskRecord:
 class TaskThrottler:
     """Controls task pacing to maintain 24±3 tasks per hour"""
     
+    RANDOM_POOL_SIZE = 1024
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
@@ -32,47 +35,76 @@ class TaskThrottler:
         self.min_tasks_per_hour = self.target_tasks_per_hour - self.variance_range
         self.max_tasks_per_hour = self.target_tasks_per_hour + self.variance_range
         
-        # Timing calculations
-        self.base_interval = 3600 / self.target_tasks_per_hour  # 150 seconds
-        self.min_interval = 3600 / self.max_tasks_per_hour  # ~133 seconds
-        self.max_interval = 3600 / self.min_tasks_per_hour  # ~171 seconds
-        
-        # Task tracking
-        self.task_history: deque = deque(maxlen=100)
-        self.session_start_time = time.time()
+        # Timing calculations (150s base, ~133-171s range at the default target)
+        self._random = UniformPool(self.RANDOM_POOL_SIZE)
+        self._next_interval: Optional[float] = None  # Drawn once per completed task
+        self._schedule_cache: Optional[Dict[str, Any]] = None  # Cleared when pacing or break threshold changes
+        self._recompute_intervals()
+        
+        # Task tracking; all timings use the monotonic clock, which NTP adjustments cannot move
+        now = time.monotonic()
+        self.task_history: deque = deque()  # Tasks completed within the last hour
+        self.session_start_time = now
+        self.session_start_wall = time.time()  # Wall clock, for reporting only
         self.last_task_time = 0
         self.tasks_completed = 0
         
         # Break management
-        self.tasks_since_last_break = 0
-        self.break_threshold = random.randint(10, 12)  # Break after 10-12 tasks
-        self.last_break_time = time.time()
+        self._reset_break_cycle(now)
         
-        # Current hour tracking
-        self.current_hour_start = time.time()
+        # Current hour tracking (reporting only; the hourly cap is the token bucket below)
+        self.current_hour_start = now
         self.current_hour_tasks = 0
         
+        # Hourly cap as a token bucket: bursts up to max_tasks_per_hour, refilled at the target rate
+        self._tokens = float(self.max_tasks_per_hour)
+        self._last_refill = now
+        
+        self._break_until = 0.0  # Monotonic deadline of the current break
+        
+        # Set to cut breaks and delays short, e.g. on shutdown
+        self._wake_event = threading.Event()
+        
         self.logger.info(f"Task throttler initialized: {self.min_tasks_per_hour}-{self.max_tasks_per_hour} tasks/hour")
     
     def should_perform_task(self) -> bool:
         """Determine if a task should be performed now"""
-        current_time = time.time()
-        
-        # Check if we need a break
+        current_time = time.monotonic()
+        self._start_break_if_due(current_time)
+        return self._check(current_time)[0]
+    
+    def _start_break_if_due(self, current_time: float):
+        """Begin a break when one is due and none is in progress"""
+        if current_time >= self._break_until and self._should_take_break(current_time):
+            self.logger.debug("Taking scheduled break")
+            self._schedule_break()
+    
+    def _check(self, current_time: float) -> Tuple[bool, float]:
+        """Decide whether a task may start now, returning (allowed, seconds to wait)"""
+        # Check if we are on a break, or due one; starting it is left to _start_break_if_due
+        break_until = self._break_until
+        if current_time < break_until:
+            return False, break_until - current_time
         if self._should_take_break(current_time):
-            self.logger.info("Taking scheduled break")
-            return False
+            return False, 450.0  # Average break length
         
         # Check if we've reached hourly limit
-        if self._reached_hourly_limit(current_time):
-            self.logger.info("Hourly task limit reached, waiting")
-            return False
+        tokens = self._refill_tokens(current_time)
+        if tokens < 1:
+            self.logger.debug("Hourly task limit reached, waiting")
+            return False, (1 - tokens) / self._refill_rate
         
         # Check if enough time has passed since last task
-        if self._should_wait_longer(current_time):
-            return False
-        
-        return True
+        last_task_time = self.last_task_time
+        if last_task_time > 0:
+            next_interval = self._next_interval
+            if next_interval is None:
+                next_interval = self._next_interval = self._calculate_next_interval()
+            remaining = next_interval - (current_time - last_task_time)
+            if remaining > 0:
+                return False, remaining
+        
+        return True, 0
     
     def _should_take_break(self, current_time: float) -> bool:
         """Check if it's time for a break"""
@@ -86,31 +118,19 @@ class TaskThrottler:
         
         return False
     
-    def _reached_hourly_limit(self, current_time: float) -> bool:
-        """Check if we've reached the hourly task limit"""
-        # Reset hour counter if hour has passed
-        if current_time - self.current_hour_start >= 3600:
-            self.current_hour_start = current_time
-            self.current_hour_tasks = 0
-            self.logger.info("New hour started, resetting task counter")
-        
-        # Check if we've exceeded max tasks for this hour
-        return self.current_hour_tasks >= self.max_tasks_per_hour
-    
-    def _should_wait_longer(self, current_time: float) -> bool:
-        """Check if we should wait longer before next task"""
-        if self.last_task_time == 0:
-            return False
-        
-        time_since_last = current_time - self.last_task_time
-        required_interval = self._calculate_next_interval()
-        
-        return time_since_last < required_interval
+    def _refill_tokens(self, current_time: float) -> float:
+        """Top up the hourly token bucket for the time elapsed since the last refill"""
+        elapsed = current_time - self._last_refill
+        self._tokens = min(self.max_tasks_per_hour, self._tokens + elapsed * self._refill_rate)
+        self._last_refill = current_time
+        return self._tokens
     
     def _calculate_next_interval(self) -> float:
         """Calculate the interval until the next task"""
+        rand_uniform = self._random.uniform
+        
         # Base interval with randomization
-        base_interval = random.uniform(self.min_interval, self.max_interval)
+        base_interval = rand_uniform(self.min_interval, self.max_interval)
         
         # Adjust based on recent task rate
         recent_rate = self._get_recent_task_rate()
@@ -122,29 +142,29 @@ class TaskThrottler:
             base_interval *= 0.8
         
         # Add natural variation
-        variation = random.uniform(-30, 30)  # ±30 seconds
+        variation = rand_uniform(-30, 30)  # ±30 seconds
         final_interval = base_interval + variation
         
         # Ensure reasonable bounds
-        return max(60, min(300, final_interval))  # 1-5 minutes
+        return max(60.0, min(300.0, final_interval))  # 1-5 minutes
     
     def _get_recent_task_rate(self) -> float:
         """Get task rate for the last hour"""
-        if len(self.task_history) < 2:
+        if self.tasks_completed < 2:
             return self.target_tasks_per_hour
         
-        current_time = time.time()
-        recent_tasks = [task for task in self.task_history 
-                       if current_time - task.timestamp <= 3600]
-        
-        if not recent_tasks:
-            return 0
-        
-        return len(recent_tasks)
+        return self._count_recent_tasks(time.monotonic())
+    
+    def _count_recent_tasks(self, current_time: float) -> int:
+        """Count tasks completed in the last hour, dropping older records"""
+        history = self.task_history
+        while history and current_time - history[0].timestamp > 3600:
+            history.popleft()
+        return len(history)
     
     def task_completed(self, task_id: str = "", duration: float = 0):
         """Record a completed task"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Record the task
         task_record = TaskRecord(
@@ -153,71 +173,71 @@ class TaskThrottler:
             task_id=task_id
         )
         self.task_history.append(task_record)
+        self._count_recent_tasks(current_time)
+        
+        # Spend a token from the hourly bucket
+        self._refill_tokens(current_time)
+        self._tokens -= 1
+        
+        # Reset hour counter if hour has passed
+        self._roll_hour(current_time)
         
         # Update counters
         self.tasks_completed += 1
         self.current_hour_tasks += 1
         self.tasks_since_last_break += 1
         self.last_task_time = current_time
+        self._next_interval = None
         
-        self.logger.info(f"Task completed: {self.tasks_completed} total, "
-                        f"{self.current_hour_tasks} this hour")
+        self.logger.debug("Task completed: %d total, %d this hour",
+                          self.tasks_completed, self.current_hour_tasks)
         
         # Check if we need to take a break after this task
         if self.tasks_since_last_break >= self.break_threshold:
             self._schedule_break()
     
+    def _roll_hour(self, current_time: float):
+        """Start a fresh hourly counter once the current hour has passed"""
+        if current_time - self.current_hour_start >= 3600:
+            self.current_hour_start = current_time
+            self.current_hour_tasks = 0
+            self.logger.debug("New hour started, resetting task counter")
+    
     def _schedule_break(self):
         """Schedule a break after completing tasks"""
-        break_duration = random.uniform(300, 600)  # 5-10 minutes
+        break_duration = self._random.uniform(300, 600)  # 5-10 minutes
         self.logger.info(f"Scheduling break for {break_duration:.1f} seconds")
         
-        # Reset break counters
-        self.tasks_since_last_break = 0
-        self.last_break_time = time.time()
-        self.break_threshold = random.randint(10, 12)  # Next break after 10-12 tasks
+        self._reset_break_cycle(time.monotonic())
         
-        # Actually take the break
-        time.sleep(break_duration)
-        self.logger.info("Break completed")
+        # Tasks are refused until the break ends; the caller is not blocked
+        self._break_until = self.last_break_time + break_duration
     
     def get_next_task_delay(self) -> float:
         """Get the delay until the next task should be performed"""
-        if self.should_perform_task():
-            return 0
-        
-        current_time = time.time()
-        
-        # If we need a break, return break duration
-        if self._should_take_break(current_time):
-            return random.uniform(300, 600)
-        
-        # If we've reached hourly limit, wait until next hour
-        if self._reached_hourly_limit(current_time):
-            time_until_next_hour = 3600 - (current_time - self.current_hour_start)
-            return time_until_next_hour
-        
-        # Calculate time until next task
-        if self.last_task_time > 0:
-            time_since_last = current_time - self.last_task_time
-            required_interval = self._calculate_next_interval()
-            return max(0, required_interval - time_since_last)
-        
-        return 0
+        return self._check(time.monotonic())[1]
     
     def get_throttling_status(self) -> Dict[str, Any]:
         """Get current throttling status"""
-        current_time = time.time()
+        current_time = time.monotonic()
+        
+        # Don't report the previous hour's count after an idle hour
+        self._roll_hour(current_time)
+        
+        # Report the last task as a wall-clock timestamp
+        last_task_wall = 0
+        if self.last_task_time > 0:
+            last_task_wall = self.session_start_wall + (self.last_task_time - self.session_start_time)
         
         return {
             'tasks_completed': self.tasks_completed,
             'current_hour_tasks': self.current_hour_tasks,
             'tasks_since_break': self.tasks_since_last_break,
             'recent_task_rate': self._get_recent_task_rate(),
-            'next_task_delay': self.get_next_task_delay(),
+            'next_task_delay': self._check(current_time)[1],
             'time_until_break': self.break_threshold - self.tasks_since_last_break,
             'session_duration': current_time - self.session_start_time,
-            'last_task_time': self.last_task_time,
+            'last_task_time': last_task_wall,
             'target_range': f"{self.min_tasks_per_hour}-{self.max_tasks_per_hour}"
         }
     
@@ -227,30 +247,30 @@ class TaskThrottler:
         self.min_tasks_per_hour = target_tasks_per_hour - self.variance_range
         self.max_tasks_per_hour = target_tasks_per_hour + self.variance_range
         
-        # Recalculate intervals
-        self.base_interval = 3600 / self.target_tasks_per_hour
-        self.min_interval = 3600 / self.max_tasks_per_hour
-        self.max_interval = 3600 / self.min_tasks_per_hour
+        self._recompute_intervals()
         
         self.logger.info(f"Pacing adjusted to {self.min_tasks_per_hour}-{self.max_tasks_per_hour} tasks/hour")
     
+    def _reset_break_cycle(self, current_time: float):
+        """Start a new work cycle ending in a break after 10-12 tasks"""
+        self.tasks_since_last_break = 0
+        self.last_break_time = current_time
+        self.break_threshold = random.randrange(10, 13)
+        self._schedule_cache = None
+    
     def force_break(self, duration: float = None):
         """Force a break for specified duration"""
         if duration is None:
-            duration = random.uniform(300, 600)
+            duration = self._random.uniform(300, 600)
         
         self.logger.info(f"Forcing break for {duration:.1f} seconds")
         
-        self.tasks_since_last_break = 0
-        self.last_break_time = time.time()
-        self.break_threshold = random.randint(10, 12)
-        
-        time.sleep(duration)
-        self.logger.info("Forced break completed")
+        self._reset_break_cycle(time.monotonic())
+        self._break_until = self.last_break_time + duration
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics"""
-        current_time = time.time()
+        current_time = time.monotonic()
         session_duration = current_time - self.session_start_time
         
         # Calculate average task rate
@@ -260,17 +280,14 @@ class TaskThrottler:
             avg_tasks_per_hour = 0
         
         # Calculate recent performance
-        recent_tasks = [task for task in self.task_history 
-                       if current_time - task.timestamp <= 3600]
-        recent_rate = len(recent_tasks)
+        recent_rate = self._count_recent_tasks(current_time)
         
-        # Calculate task intervals
-        intervals = []
-        for i in range(1, len(self.task_history)):
-            interval = self.task_history[i].timestamp - self.task_history[i-1].timestamp
-            intervals.append(interval)
-        
-        avg_interval = sum(intervals) / len(intervals) if intervals else 0
+        # Intervals over the last hour telescope, so their mean only needs the oldest and newest task
+        history = self.task_history
+        if len(history) > 1:
+            avg_interval = (history[-1].timestamp - history[0].timestamp) / (len(history) - 1)
+        else:
+            avg_interval = 0
         
         return {
             'session_duration_hours': session_duration / 3600,
@@ -286,24 +303,72 @@ class TaskThrottler:
     def reset_session(self):
         """Reset session statistics"""
         self.task_history.clear()
-        self.session_start_time = time.time()
+        now = time.monotonic()
+        self.session_start_time = now
+        self.session_start_wall = time.time()
         self.last_task_time = 0
+        self._next_interval = None
         self.tasks_completed = 0
-        self.tasks_since_last_break = 0
-        self.last_break_time = time.time()
-        self.current_hour_start = time.time()
+        self._reset_break_cycle(now)
+        self.current_hour_start = now
         self.current_hour_tasks = 0
+        self._tokens = float(self.max_tasks_per_hour)
+        self._last_refill = now
+        self._break_until = 0.0
         
         self.logger.info("Session reset")
     
     def simulate_natural_delay(self):
         """Add natural delay between actions"""
         # Short random pause to simulate human thinking
-        delay = random.uniform(1, 5)
-        time.sleep(delay)
+        delay = self._random.uniform(1, 5)
+        self._wake_event.wait(delay)
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a task may be performed; False if interrupted or timed out"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current_time = time.monotonic()
+            self._start_break_if_due(current_time)
+            allowed, retry_after = self._check(current_time)
+            if allowed:
+                return True
+            
+            if deadline is not None:
+                if current_time >= deadline:
+                    return False
+                retry_after = min(retry_after, deadline - current_time)
+            
+            # One wait for the exact retry time instead of polling
+            if self._wake_event.wait(retry_after):
+                return False
+    
+    def wait_if_on_break(self):
+        """Block until the current break ends, or until interrupted"""
+        remaining = self._break_until - time.monotonic()
+        if remaining > 0:
+            self._wake_event.wait(remaining)
+    
+    def interrupt(self):
+        """Wake any break wait or delay in progress so the caller can shut down"""
+        self._wake_event.set()
+    
+    def reset_interrupt(self):
+        """Re-arm breaks and delays after an interrupt, e.g. when the agent is restarted"""
+        self._wake_event.clear()
     
     def get_optimal_work_schedule(self) -> Dict[str, Any]:
         """Get optimal work schedule for the day"""
+        if self._schedule_cache is None:
+            self._schedule_cache = self._build_work_schedule()
+        
+        # Hand out copies so callers can't mutate the cache
+        schedule = dict(self._schedule_cache)
+        schedule['hourly_distribution'] = dict(schedule['hourly_distribution'])
+        return schedule
+    
+    def _build_work_schedule(self) -> Dict[str, Any]:
+        """Compute the work schedule from the current pacing and break threshold"""
         # Calculate breaks and work periods
         tasks_per_break_cycle = (self.break_threshold + 1) // 2
         break_cycles_per_hour = 60 / (tasks_per_break_cycle * 2.5)  # Rough estimate
@@ -333,6 +398,14 @@ class TaskThrottler:
                            f"{original_min}-{original_max} -> "
                            f"{self.min_tasks_per_hour}-{self.max_tasks_per_hour} tasks/hour")
         
-        # Recalculate intervals
-        self.min_interval = 3600 / self.max_tasks_per_hour
-        self.max_interval = 3600 / self.min_tasks_per_hour
\ No newline at end of file
+        self._recompute_intervals()
+    
+    def _recompute_intervals(self):
+        """Derive intervals and refill rate from the hourly targets, rebuilding everything cached on them"""
+        self.base_interval = 3600.0 / self.target_tasks_per_hour
+        self.min_interval = 3600.0 / self.max_tasks_per_hour
+        self.max_interval = 3600.0 / self.min_tasks_per_hour
+        # Never refill faster than the hourly maximum, which emergency_throttle can drop below target
+        self._refill_rate = min(self.target_tasks_per_hour, self.max_tasks_per_hour) / 3600.0
+        self._next_interval = None
+        self._schedule_cache = None
\ No newline at end of file